@@ -1,12 +1,17 @@
 import argparse
-import json
+import base64
+import bisect
+import functools
+import pickle
 import re
+import shutil
 import sys
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Callable, Dict, Iterable, List, NamedTuple, Tuple
 
+import orjson
 import requests
-from hearthstone import deckstrings
 from hearthstone.enums import FormatType
 
 
@@ -16,19 +21,83 @@ CARD_FILES = {
     True: "cards.collectible.json",
     False: "cards.json",
 }
+LOOKUP_CACHE_VERSION = 2
+LOOKUP_CACHE_FILES = {
+    True: f"lookups.collectible.v{LOOKUP_CACHE_VERSION}.pkl",
+    False: f"lookups.v{LOOKUP_CACHE_VERSION}.pkl",
+}
+CLEAN_TEXT_KEY = "_clean_text"
 TAG_RE = re.compile(r"<[^>]+>")
+UNSAFE_FILENAME_RE = re.compile(r"[^0-9A-Za-z\u4e00-\u9fff\-_ ]+")
 DERIVED_CARD_TYPES = {"MINION", "SPELL", "WEAPON", "LOCATION", "HERO", "HERO_POWER"}
-_DERIVED_CACHE: Dict[str, List[dict]] = {}
+HERO_CLASSES = (
+    "DEATHKNIGHT",
+    "DEMON HUNTER",
+    "DRUID",
+    "HUNTER",
+    "MAGE",
+    "NEUTRAL",
+    "PALADIN",
+    "PRIEST",
+    "ROGUE",
+    "SHAMAN",
+    "WARLOCK",
+    "WARRIOR",
+    "UNKNOWN",
+)
+# Title-cased display names for common values; anything else falls back to str.title()
+_TITLE_CASE = {value: value.title() for value in (*DERIVED_CARD_TYPES, "?", *HERO_CLASSES)}
+DERIVED_CACHE_SIZE = 4096
 CACHE_ROOT = Path(".cache/hearthstonejson")
 _LATEST_BUILD_CACHE: Dict[Tuple[str, str], Tuple[str, str]] = {}
+# Shared so the HEAD probe and the download reuse one keep-alive connection
+_SESSION = requests.Session()
+DECKSTRING_VERSION = 1
+
+
+class DecodedDeck(NamedTuple):
+    """Deck contents in the same shape as ``hearthstone.deckstrings.Deck``."""
+
+    format: FormatType
+    heroes: List[int]
+    cards: List[Tuple[int, int]]
+    sideboards: List[Tuple[int, int, int]]
+
+
+@dataclass(slots=True, kw_only=True)
+class DerivedCardInfo:
+    """A card generated by a deck card, with fields in output JSON order."""
+
+    id: str | None
+    dbfId: int | None
+    name: str
+    type: str
+    cost: int | None
+    text: str
+
+
+@dataclass(slots=True, kw_only=True)
+class CardInfo:
+    """Structured details for one deck or sideboard entry, in output JSON order."""
+
+    dbfId: int | None
+    id: str | None
+    name: str | None
+    type: str | None
+    cost: int | str | None
+    copies: int
+    text: str
+    missing: bool = False
+    summary: str
+    derivedSummaries: List[str]
+    derived: List[DerivedCardInfo]
 
 
 def fetch_cards(locale: str, collectible_only: bool) -> List[dict]:
     """Download card data for the specified locale."""
     filename = CARD_FILES[collectible_only]
     cached_file = ensure_cached_file(locale, filename)
-    with cached_file.open(encoding="utf-8") as handle:
-        return json.load(handle)
+    return orjson.loads(cached_file.read_bytes())
 
 
 def resolve_latest_build(locale: str, filename: str) -> Tuple[str, str]:
@@ -38,7 +107,7 @@ def resolve_latest_build(locale: str, filename: str) -> Tuple[str, str]:
         return _LATEST_BUILD_CACHE[key]
 
     url = CARD_JSON_BASE.format(locale=locale, filename=filename)
-    resp = requests.head(url, allow_redirects=True, timeout=30)
+    resp = _SESSION.head(url, allow_redirects=True, timeout=30)
     resp.raise_for_status()
     resolved_url = resp.url.rstrip("/")
     parts = resolved_url.split("/")
@@ -62,56 +131,153 @@ def ensure_cached_file(locale: str, filename: str) -> Path:
     if cache_file.exists():
         return cache_file
 
-    # Need to download the current version
+    # Need to download the current version, unless it matches an older build's copy
     download_url = CARD_BUILD_BASE.format(build=build_id, locale=locale, filename=filename)
-    resp = requests.get(download_url, timeout=120)
+    etag_file = cache_dir / f"{filename}.etag"
+    previous = find_previous_download(locale, filename)
+    headers = {}
+    if previous is not None:
+        headers["If-None-Match"] = previous[1]
+    resp = _SESSION.get(download_url, headers=headers, timeout=120)
+    if resp.status_code == 304 and previous is not None:
+        shutil.copyfile(previous[0], cache_file)
+        etag_file.write_text(previous[1], encoding="utf-8")
+        return cache_file
+
     resp.raise_for_status()
     cache_file.write_bytes(resp.content)
+    etag = resp.headers.get("ETag")
+    if etag:
+        etag_file.write_text(etag, encoding="utf-8")
     return cache_file
 
 
-def build_lookups(cards: Iterable[dict]) -> Tuple[Dict[int, dict], Dict[str, dict]]:
-    """Index cards by dbfId and card id for quick lookups."""
+def find_previous_download(locale: str, filename: str) -> Tuple[Path, str] | None:
+    """Return the most recent cached copy of a file from any build, with its ETag."""
+    candidates = []
+    for etag_file in CACHE_ROOT.glob(f"*/{locale}/{filename}.etag"):
+        cache_file = etag_file.with_name(filename)
+        if cache_file.exists():
+            candidates.append((etag_file.stat().st_mtime, cache_file, etag_file))
+    if not candidates:
+        return None
+    _, cache_file, etag_file = max(candidates)
+    etag = etag_file.read_text(encoding="utf-8").strip()
+    return (cache_file, etag) if etag else None
+
+
+def build_lookups(
+    cards: Iterable[dict], collectible_only: bool = False
+) -> Tuple[Dict[int, dict], Dict[str, dict], List[str]]:
+    """Index cards by dbfId and card id, plus the sorted ids for prefix searches.
+
+    With ``collectible_only`` the dbfId index skips uncollectible cards, while the
+    id index still covers every card so derived tokens can be found.
+    """
     by_dbf: Dict[int, dict] = {}
     by_id: Dict[str, dict] = {}
     for card in cards:
+        clean_text(card)
         dbf_id = card.get("dbfId")
-        if dbf_id is not None:
+        if dbf_id is not None and (not collectible_only or card.get("collectible")):
             by_dbf[int(dbf_id)] = card
         card_id = card.get("id")
         if card_id:
             by_id[card_id] = card
-    return by_dbf, by_id
+    return by_dbf, by_id, sorted(by_id)
 
 
 def merge_id_lookup(base: Dict[str, dict], other: Dict[str, dict]) -> Dict[str, dict]:
-    """Merge another id->card mapping, keeping existing entries when conflicts occur."""
-    merged = dict(base)
+    """Merge another id->card mapping into ``base`` in place and return it.
+
+    Existing entries in ``base`` win when both mappings contain the same id.
+    """
     for cid, card in other.items():
-        if cid not in merged:
-            merged[cid] = card
-    return merged
+        base.setdefault(cid, card)
+    return base
+
+
+def load_lookups(
+    locale: str, collectible_only: bool
+) -> Tuple[Dict[int, dict], Dict[str, dict], List[str]]:
+    """Return the dbfId and card id lookups, reusing a pickled copy for the latest build."""
+    build_id, _ = resolve_latest_build(locale, CARD_FILES[False])
+    cache_file = CACHE_ROOT / build_id / locale / LOOKUP_CACHE_FILES[collectible_only]
+    if cache_file.exists():
+        try:
+            with cache_file.open("rb") as handle:
+                return pickle.load(handle)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass  # Rebuild below if the cache is unreadable
+
+    # cards.json is a superset of cards.collectible.json, so one file covers both modes
+    cards = fetch_cards(locale, collectible_only=False)
+    lookups = build_lookups(cards, collectible_only=collectible_only)
+
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    with cache_file.open("wb") as handle:
+        pickle.dump(lookups, handle, protocol=5)
+    return lookups
 
 
 def strip_tags(text: str) -> str:
     """Remove Hearthstone markup, brackets and redundant whitespace."""
-    cleaned = TAG_RE.sub("", text)
-    cleaned = cleaned.replace("[x]", "")
-    return re.sub(r"\s+", " ", cleaned).strip()
+    if "<" in text:
+        text = TAG_RE.sub("", text)
+    # split()/join collapses whitespace runs and trims the ends in one pass
+    return " ".join(text.replace("[x]", "").split())
+
+
+def clean_text(card: dict) -> str:
+    """Return the card's text without markup, cleaning it once per card dict."""
+    text = card.get(CLEAN_TEXT_KEY)
+    if text is None:
+        text = strip_tags(card["text"]) if card.get("text") else ""
+        card[CLEAN_TEXT_KEY] = text
+    return text
+
 
+class _LookupRef:
+    """Hashable handle on one set of id lookups, compared by identity."""
 
-def collect_prefixed_cards(card_id: str, cards_by_id: Dict[str, dict]) -> List[dict]:
+    __slots__ = ("cards_by_id", "sorted_ids")
+
+    def __init__(self, cards_by_id: Dict[str, dict], sorted_ids: List[str]) -> None:
+        self.cards_by_id = cards_by_id
+        self.sorted_ids = sorted_ids
+
+    def __hash__(self) -> int:
+        return hash((id(self.cards_by_id), id(self.sorted_ids)))
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, _LookupRef)
+            and self.cards_by_id is other.cards_by_id
+            and self.sorted_ids is other.sorted_ids
+        )
+
+
+def collect_prefixed_cards(
+    card_id: str, cards_by_id: Dict[str, dict], sorted_ids: List[str]
+) -> List[dict]:
     if not card_id:
         return []
-    if card_id in _DERIVED_CACHE:
-        return _DERIVED_CACHE[card_id]
+    return _collect_prefixed_cards(card_id, _LookupRef(cards_by_id, sorted_ids))
+
 
+@functools.lru_cache(maxsize=DERIVED_CACHE_SIZE)
+def _collect_prefixed_cards(card_id: str, lookups: _LookupRef) -> List[dict]:
+    cards_by_id = lookups.cards_by_id
+    sorted_ids = lookups.sorted_ids
     related: List[dict] = []
     seen: set[str] = set()
-    for other_id, other_card in cards_by_id.items():
-        if other_id == card_id or not other_id.startswith(card_id):
-            continue
-        if other_card.get("type") not in DERIVED_CARD_TYPES:
+    # Ids sharing the prefix form one contiguous run in the sorted list
+    for idx in range(bisect.bisect_left(sorted_ids, card_id), len(sorted_ids)):
+        other_id = sorted_ids[idx]
+        if not other_id.startswith(card_id):
+            break
+        other_card = cards_by_id[other_id]
+        if other_id == card_id or other_card.get("type") not in DERIVED_CARD_TYPES:
             continue
         if other_id in seen:
             continue
@@ -119,65 +285,83 @@ def collect_prefixed_cards(card_id: str, cards_by_id: Dict[str, dict]) -> List[d
         related.append(other_card)
 
     related.sort(key=lambda c: (len(c.get("id", "")), c.get("cost", 0), c.get("name", "")))
-    _DERIVED_CACHE[card_id] = related
     return related
 
 
 def describe_card(
-    card: dict, copies: int, cards_by_id: Dict[str, dict]
-) -> Tuple[str, List[str], dict]:
+    card: dict, copies: int, cards_by_id: Dict[str, dict], sorted_ids: List[str]
+) -> Tuple[str, List[str], CardInfo]:
     """Return formatted description plus optional derived lines and structured info."""
     name = card.get("name", "Unknown")
     cost = card.get("cost", "?")
-    ctype = card.get("type", "?").title()
-    text = strip_tags(card.get("text", "")) if card.get("text") else ""
+    ctype = card.get("type", "?")
+    ctype = _TITLE_CASE.get(ctype) or ctype.title()
+    text = clean_text(card)
     main_line = f"({cost}) {name} x{copies} [{ctype}]"
     if text:
         main_line = f"{main_line} - {text}"
 
-    derived_cards = collect_prefixed_cards(card.get("id", ""), cards_by_id)
+    derived_cards = collect_prefixed_cards(card.get("id", ""), cards_by_id, sorted_ids)
     derived_lines: List[str] = []
-    derived_entries: List[dict] = []
+    derived_entries: List[DerivedCardInfo] = []
     for related in derived_cards:
         related_name = related.get("name", related.get("id", "Unknown"))
-        related_type = related.get("type", "?").title()
-        related_text = strip_tags(related.get("text", "")) if related.get("text") else ""
+        related_type = related.get("type", "?")
+        related_type = _TITLE_CASE.get(related_type) or related_type.title()
+        related_text = clean_text(related)
         extra = f" -> {related_name} [{related_type}]"
         if related_text:
             extra = f"{extra} - {related_text}"
         derived_lines.append(extra)
         derived_entries.append(
-            {
-                "id": related.get("id"),
-                "dbfId": related.get("dbfId"),
-                "name": related_name,
-                "type": related_type,
-                "cost": related.get("cost"),
-                "text": related_text,
-            }
+            DerivedCardInfo(
+                id=related.get("id"),
+                dbfId=related.get("dbfId"),
+                name=related_name,
+                type=related_type,
+                cost=related.get("cost"),
+                text=related_text,
+            )
         )
 
-    card_info = {
-        "dbfId": card.get("dbfId"),
-        "id": card.get("id"),
-        "name": name,
-        "type": ctype,
-        "cost": cost,
-        "copies": copies,
-        "text": text,
-        "summary": main_line,
-        "derivedSummaries": derived_lines,
-        "derived": derived_entries,
-    }
+    card_info = CardInfo(
+        dbfId=card.get("dbfId"),
+        id=card.get("id"),
+        name=name,
+        type=ctype,
+        cost=cost,
+        copies=copies,
+        text=text,
+        summary=main_line,
+        derivedSummaries=derived_lines,
+        derived=derived_entries,
+    )
 
     return main_line, derived_lines, card_info
 
 
+def describe_missing_card(dbf_id: int, copies: int) -> CardInfo:
+    """Return the placeholder entry for a dbfId that is not in the card data."""
+    return CardInfo(
+        dbfId=dbf_id,
+        id=None,
+        name=None,
+        type=None,
+        cost=None,
+        copies=copies,
+        text="",
+        missing=True,
+        summary=f"Unknown card (dbfId={dbf_id}) x{copies}",
+        derivedSummaries=[],
+        derived=[],
+    )
+
+
 def describe_hero(card: dict) -> str:
     hero_class = card.get("cardClass", "UNKNOWN") if card else "UNKNOWN"
     hero_class = hero_class.replace("DEMONHUNTER", "DEMON HUNTER")
     name = card.get("name", "Unknown Hero") if card else "Unknown Hero"
-    return f"{name} ({hero_class.title()})"
+    return f"{name} ({_TITLE_CASE.get(hero_class) or hero_class.title()})"
 
 
 def format_name(deck_format: FormatType) -> str:
@@ -186,17 +370,118 @@ def format_name(deck_format: FormatType) -> str:
     return str(deck_format)
 
 
-def decode_deck(deck_code: str) -> deckstrings.Deck:
+def read_varints(buf: bytes, start: int = 0) -> List[int]:
+    """Decode every unsigned LEB128 varint in ``buf`` from ``start`` onwards."""
+    values: List[int] = []
+    result = 0
+    shift = 0
+    for byte in buf[start:]:
+        if byte & 0x80:
+            result |= (byte & 0x7F) << shift
+            shift += 7
+        else:
+            values.append(result | (byte << shift))
+            result = 0
+            shift = 0
+    if shift:
+        raise ValueError("Unexpected end of deckstring")
+    return values
+
+
+@functools.lru_cache(maxsize=None)
+def native_varint_reader() -> Callable[[bytes, int], List[int]] | None:
+    """Return a numba-compiled equivalent of read_varints, or None without numba.
+
+    numba is imported lazily because it adds far more start-up time than a
+    single-deck CLI run spends decoding; only batch callers should pay for it.
+    """
+    try:
+        import numpy as np
+        from numba import njit
+    except ImportError:
+        return None
+
+    @njit(cache=True)
+    def decode_native(buf, start):
+        values = np.empty(len(buf) - start, dtype=np.int64)
+        count = 0
+        result = 0
+        shift = 0
+        for idx in range(start, len(buf)):
+            byte = np.int64(buf[idx])
+            if byte & 0x80:
+                result |= (byte & 0x7F) << shift
+                shift += 7
+            else:
+                values[count] = result | (byte << shift)
+                count += 1
+                result = 0
+                shift = 0
+        return values[:count], shift
+
+    def reader(buf: bytes, start: int = 0) -> List[int]:
+        values, shift = decode_native(np.frombuffer(buf, dtype=np.uint8), start)
+        if shift:
+            raise ValueError("Unexpected end of deckstring")
+        return values.tolist()
+
+    return reader
+
+
+def parse_deckstring(
+    deck_code: str, varint_reader: Callable[[bytes, int], List[int]] = read_varints
+) -> DecodedDeck:
+    """Decode a Blizzard deckstring: a zero byte followed by varint-encoded sections."""
+    buf = base64.b64decode(deck_code)
+    if not buf or buf[0] != 0:
+        raise ValueError("Invalid deckstring")
+    # The trailing sideboard flag is a single 0/1 byte, which also reads as a varint
+    values = iter(varint_reader(buf, 1))
+    read = values.__next__
+
     try:
-        return deckstrings.Deck.from_deckstring(deck_code)
+        version = read()
+        if version != DECKSTRING_VERSION:
+            raise ValueError(f"Unsupported deckstring version {version!r}")
+        deck_format = FormatType(read())
+
+        heroes = sorted([read() for _ in range(read())])
+
+        cards: List[Tuple[int, int]] = [(read(), 1) for _ in range(read())]
+        cards.extend([(read(), 2) for _ in range(read())])
+        cards.extend([(read(), read()) for _ in range(read())])
+        cards.sort()
+
+        sideboards: List[Tuple[int, int, int]] = []
+        if next(values, 0) == 1:
+            sideboards = [(read(), 1, read()) for _ in range(read())]
+            sideboards.extend([(read(), 2, read()) for _ in range(read())])
+            sideboards.extend([(read(), read(), read()) for _ in range(read())])
+            sideboards.sort(key=lambda item: (item[2], item[0]))
+    except StopIteration:
+        raise ValueError("Unexpected end of deckstring") from None
+
+    return DecodedDeck(deck_format, heroes, cards, sideboards)
+
+
+def decode_deck(deck_code: str) -> DecodedDeck:
+    try:
+        return parse_deckstring(deck_code)
     except Exception as exc:  # pragma: no cover - runtime guard
         raise SystemExit(f"Failed to decode deck code: {exc}") from exc
 
 
+def decode_decks(deck_codes: Iterable[str]) -> List[DecodedDeck]:
+    """Decode many deck codes, using the compiled varint reader when numba is installed."""
+    varint_reader = native_varint_reader() or read_varints
+    return [parse_deckstring(code, varint_reader) for code in deck_codes]
+
+
 def summarize_deck(
-    deck: deckstrings.Deck,
+    deck: DecodedDeck,
     cards_by_dbf: Dict[int, dict],
     cards_by_id: Dict[str, dict],
+    sorted_ids: List[str],
     deck_code: str,
 ) -> dict:
     report = {
@@ -220,31 +505,19 @@ def summarize_deck(
             }
         )
 
-    sorted_cards = sorted(
-        deck.cards, key=lambda item: (cards_by_dbf.get(item[0], {}).get("cost", 0), item[0])
-    )
-    for dbf_id, copies in sorted_cards:
+    # Resolve each card once and sort on a plain (cost, dbfId) key
+    entries = []
+    for dbf_id, copies in deck.cards:
         card = cards_by_dbf.get(dbf_id)
+        cost = card.get("cost", 0) if card is not None else 0
+        entries.append((cost, dbf_id, copies, card))
+    entries.sort(key=lambda entry: (entry[0], entry[1]))
+    for _, dbf_id, copies, card in entries:
         if card is None:
-            summary = f"Unknown card (dbfId={dbf_id}) x{copies}"
-            report["cards"].append(
-                {
-                    "dbfId": dbf_id,
-                    "id": None,
-                    "name": None,
-                    "type": None,
-                    "cost": None,
-                    "copies": copies,
-                    "text": "",
-                    "missing": True,
-                    "summary": summary,
-                    "derivedSummaries": [],
-                    "derived": [],
-                }
-            )
+            report["cards"].append(describe_missing_card(dbf_id, copies))
             continue
 
-        _, _, card_info = describe_card(card, copies, cards_by_id)
+        _, _, card_info = describe_card(card, copies, cards_by_id, sorted_ids)
         report["cards"].append(card_info)
 
     if deck.sideboards:
@@ -262,66 +535,65 @@ def summarize_deck(
             for card_id, count in contents:
                 card = cards_by_dbf.get(card_id)
                 if card:
-                    _, _, card_info = describe_card(card, count, cards_by_id)
+                    _, _, card_info = describe_card(card, count, cards_by_id, sorted_ids)
                     sideboard_entry["cards"].append(card_info)
                 else:
-                    sideboard_entry["cards"].append(
-                        {
-                            "dbfId": card_id,
-                            "id": None,
-                            "name": None,
-                            "type": None,
-                            "cost": None,
-                            "copies": count,
-                            "text": "",
-                            "missing": True,
-                            "summary": f"Unknown card (dbfId={card_id}) x{count}",
-                            "derivedSummaries": [],
-                            "derived": [],
-                        }
-                    )
+                    sideboard_entry["cards"].append(describe_missing_card(card_id, count))
             report["sideboards"].append(sideboard_entry)
 
     return report
 
 
 def print_deck(report: dict) -> None:
-    print(f"Deck format: {report['format']}")
+    # Build the whole listing first and hand it to stdout in a single write
+    lines = [f"Deck format: {report['format']}"]
     if report["heroes"]:
         hero_line = " / ".join(hero["summary"] for hero in report["heroes"])
-        print("Hero:", hero_line)
+        lines.append(f"Hero: {hero_line}")
 
-    print("\nMain deck:")
+    lines.append("\nMain deck:")
     for card in report["cards"]:
-        print(f"  - {card['summary']}")
-        for extra in card["derivedSummaries"]:
-            print(f"      {extra}")
+        lines.append(f"  - {card.summary}")
+        lines.extend(f"      {extra}" for extra in card.derivedSummaries)
 
     if report["sideboards"]:
-        print("\nSideboards:")
+        lines.append("\nSideboards:")
         for sideboard in report["sideboards"]:
-            print(f"  * Sideboard for {sideboard['ownerName']}:")
+            lines.append(f"  * Sideboard for {sideboard['ownerName']}:")
             for card in sideboard["cards"]:
-                print(f"      - {card['summary']}")
-                for extra in card["derivedSummaries"]:
-                    print(f"          {extra}")
+                lines.append(f"      - {card.summary}")
+                lines.extend(f"          {extra}" for extra in card.derivedSummaries)
+
+    lines.append("")
+    sys.stdout.write("\n".join(lines))
 
 
 def safe_filename(name: str, fallback: str) -> str:
     candidate = (name or "").strip()
     if not candidate:
         candidate = fallback.strip() or "deck"
-    cleaned = re.sub(r"[^0-9A-Za-z\u4e00-\u9fff-_ ]+", "_", candidate)
+    cleaned = UNSAFE_FILENAME_RE.sub("_", candidate)
     cleaned = cleaned.strip().replace(" ", "_")
     return cleaned or fallback or "deck"
 
 
+def json_default(obj: object) -> dict:
+    """Serialize card dataclasses for orjson, listing ``missing`` only when it is set."""
+    if isinstance(obj, (CardInfo, DerivedCardInfo)):
+        data = {field.name: getattr(obj, field.name) for field in fields(obj)}
+        if not data.get("missing", True):
+            del data["missing"]
+        return data
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
 def write_deck_json(report: dict, deck_name: str | None) -> Path:
     safe_name = safe_filename(deck_name or "", report["deckCode"][:12])
     output_path = Path(f"{safe_name}.json")
     payload = dict(report)
     payload["name"] = deck_name or safe_name
-    output_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    options = orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATACLASS
+    output_path.write_bytes(orjson.dumps(payload, default=json_default, option=options))
     return output_path
 
 
@@ -349,17 +621,13 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
 
 def main(argv: List[str]) -> None:
     args = parse_args(argv)
-    cards = fetch_cards(args.locale, collectible_only=not args.all_cards)
-    cards_by_dbf, cards_by_id = build_lookups(cards)
-
-    if not args.all_cards:
-        all_cards = fetch_cards(args.locale, collectible_only=False)
-        _, all_cards_by_id = build_lookups(all_cards)
-        cards_by_id = merge_id_lookup(cards_by_id, all_cards_by_id)
+    cards_by_dbf, cards_by_id, sorted_ids = load_lookups(
+        args.locale, collectible_only=not args.all_cards
+    )
 
     deck_code = args.deck_code.strip()
     deck = decode_deck(deck_code)
-    report = summarize_deck(deck, cards_by_dbf, cards_by_id, deck_code)
+    report = summarize_deck(deck, cards_by_dbf, cards_by_id, sorted_ids, deck_code)
     print_deck(report)
     output_path = write_deck_json(report, args.deck_name)
     print(f"\nSaved deck details to {output_path}")